@@ -1,12 +1,20 @@
 import os, os.path, asyncio
-import requests
+import aiohttp
 import datetime
+import requests
 import logging
 import json
+import tempfile
+import time
+from collections import OrderedDict, defaultdict
+from contextlib import asynccontextmanager
 from datetime import datetime as dt
+from logging.handlers import RotatingFileHandler
 from typing import Any, Callable, List
 
 from google.auth.transport.requests import Request
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from google.auth.external_account_authorized_user import Credentials as ExternalCredentials
 from google.oauth2.credentials import Credentials as OauthCredentials
 from google_auth_oauthlib.flow import Flow
@@ -16,109 +24,212 @@ from googleapiclient.errors import HttpError
 
 from pydantic import BaseModel, Field
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    _json_loads = json.loads
 
 
 
-numeric_log_level = getattr(logging, "DEBUG", None)
-if not isinstance(numeric_log_level, int):
-    raise ValueError('Invalid log level: %s' % "DEBUG")
 
-# Set up logging
 logger = logging.getLogger(__name__)
-logging.basicConfig(
 
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    filename='dev_vendor_parser.log', 
-    encoding='utf-8', 
-    level=numeric_log_level
+
+def configure_logging(level: str = os.getenv("LOG_LEVEL", "WARNING"), filename: str | None = None):
+    """Set up root logging for standalone runs; hosts configure their own."""
+    numeric_log_level = getattr(logging, level.upper(), None)
+    if not isinstance(numeric_log_level, int):
+        raise ValueError('Invalid log level: %s' % level)
+
+    handlers = None
+    if filename:
+        handlers = [
+            RotatingFileHandler(filename, maxBytes=5 * 1024 * 1024, backupCount=3, encoding='utf-8')
+        ]
+    logging.basicConfig(
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=handlers,
+        level=numeric_log_level
+    )
+
+OWM_GEO = "http://api.openweathermap.org/geo/1.0/zip"
+OWM_WEATHER = "https://api.openweathermap.org/data/2.5/weather"
+IPIFY_GEO = "https://geo.ipify.org/json"
+# Full weekday, month name, day and year, then 12-hour time with AM/PM
+_TIME_FMT = "%A, %B %d, %Y, %I:%M:%S %p"
+
+# Zip -> coordinates barely ever changes; keep lookups for a week (LRU-bounded)
+_GEO_CACHE_TTL = 7 * 86400
+_GEO_CACHE_MAX = 1024
+_geo_cache: OrderedDict[tuple[str, str], tuple[dict, float]] = OrderedDict()
+# Current weather is reused briefly (LRU-bounded); concurrent misses for a key
+# share one GET. Locks are kept only while a fetch for their key is in flight
+_WEATHER_CACHE_TTL = 90
+_WEATHER_CACHE_MAX = 1024
+_weather_cache: OrderedDict[tuple[float, float], tuple[dict, float]] = OrderedDict()
+_weather_locks: dict[tuple[float, float], tuple[asyncio.Lock, int]] = {}
+
+# Google token refreshes share one keep-alive session instead of a new one per call
+_google_http = requests.Session()
+_google_adapter = HTTPAdapter(
+    pool_connections=10, pool_maxsize=20, max_retries=Retry(total=2, backoff_factor=0.1)
 )
+_google_http.mount("https://", _google_adapter)
+_google_http.mount("http://", _google_adapter)
+
+# Credentials already loaded this process, keyed by token file path
+_creds_cache: dict[str, OauthCredentials] = {}
+# Refresh tokens this close to expiry in the background instead of inline.
+# google-auth already treats credentials as invalid (forcing an inline refresh)
+# within its own REFRESH_THRESHOLD of expiry (3m45s), so this must be well wider
+_REFRESH_WINDOW = datetime.timedelta(minutes=15)
+# One auth/refresh at a time per token file; waiters reuse the winner's result
+_auth_locks: defaultdict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+_refresh_tasks: set[asyncio.Task] = set()
+
+
+def _write_token_file(token_file_path: str, creds: OauthCredentials):
+    """Atomically replace the token file with the given credentials."""
+    directory = os.path.dirname(os.path.abspath(token_file_path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as token:
+            token.write(creds.to_json())
+        os.replace(tmp_path, token_file_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+async def _background_refresh(creds: OauthCredentials, token_file_path: str):
+    """Refresh the credentials off the request path and persist them."""
+    lock = _auth_locks[token_file_path]
+    if lock.locked():
+        return
+    async with lock:
+        try:
+            await asyncio.to_thread(creds.refresh, Request(session=_google_http))
+            await asyncio.to_thread(_write_token_file, token_file_path, creds)
+        except Exception as e:
+            logger.warning("Background refresh of %s failed: %s", token_file_path, e)
+
+
+def _maybe_background_refresh(creds: OauthCredentials, token_file_path: str):
+    """Schedule a background refresh if the credentials expire soon."""
+    if not creds.refresh_token or creds.expiry is None:
+        return
+    now = dt.now(datetime.timezone.utc).replace(tzinfo=None)
+    if creds.expiry - now < _REFRESH_WINDOW:
+        task = asyncio.create_task(_background_refresh(creds, token_file_path))
+        _refresh_tasks.add(task)
+        task.add_done_callback(_refresh_tasks.discard)
 
 
 async def authenticate_with_google(
-    scopes: List[str], credentials_json_string: str, token_file_path: str, __event_emitter__: Callable[[dict], Any] = None, __event_call__: Callable[[dict], Any]=None
+    scopes: List[str], credentials_json_string: str, token_file_path: str, event_emitter: "EventEmitter | None" = None
 ) -> OauthCredentials | ExternalCredentials | str:
-    """Aunthenticate with google return the credentials"""
+    """Aunthenticate with google return the credentials
+
+    Pass the calling tool's emitter so auth statuses share its queue and stay in order.
+    """
 
-    print("\n\n*** Authenticating with Google Calendar API... ***\n\n")
-    event_emitter = EventEmitter(__event_emitter__)
+    logger.debug("Authenticating with Google Calendar API")
+    if event_emitter is None:
+        event_emitter = EventEmitter()
     await event_emitter.progress_update("Authenticating with Google Calendar API...")
-    creds = None
+    creds = _creds_cache.get(token_file_path)
+    if creds and creds.valid:
+        _maybe_background_refresh(creds, token_file_path)
+        await event_emitter.success_update("Using cached Google credentials.")
+        return creds
+
+    async with _auth_locks[token_file_path]:
+        # Another caller may have finished authenticating while we waited
+        creds = _creds_cache.get(token_file_path)
+        if creds and creds.valid:
+            await event_emitter.success_update("Using cached Google credentials.")
+            return creds
+        return await _authenticate_with_google(
+            scopes, credentials_json_string, token_file_path, event_emitter, creds
+        )
+
+
+async def _authenticate_with_google(
+    scopes: List[str], credentials_json_string: str, token_file_path: str, event_emitter: "EventEmitter", creds: OauthCredentials | None
+) -> OauthCredentials:
+    """Load, refresh or obtain credentials; callers must hold the token file lock."""
     # The file token.json stores the user's access and refresh tokens, and is
     # created automatically when the authorization flow completes for the first
     # time.
-
-    if os.path.exists(token_file_path):
+    if creds is None and os.path.exists(token_file_path):
         try:
             creds = OauthCredentials.from_authorized_user_file(token_file_path, scopes)
         except Exception as e:
             await event_emitter.error_update(
                 f"Error loading credentials from {token_file_path}: {e}"
             )
-            print(f"\n\n*** ERROR loading file ... ***\n{e}\n")
+            logger.error("Error loading credentials from %s: %s", token_file_path, e)
             creds = None
-            print(f"\n\n*** Moving Forward... ***\n{e}\n")
     
 
     
 
-    print("\n\n*** ONWARD!!! ***\n{creds}\n")
     await event_emitter.progress_update("Moving forward with authentication...")
 
     # If there are no (valid) credentials available, let the user log in.
     if not creds or not creds.valid:
-        print("\n\n*** Our creds are not valid... ***\n\n")
+        logger.debug("Credentials missing or invalid")
 
         await event_emitter.progress_update("Credentials invalid Moving forward with authentication...")
         # If the credentials are expired, try to refresh them
         if creds and creds.expired and creds.refresh_token:
 
             try:
-                print("\n\n*** Attempting to Refresh credentials... ***\n\n")
+                logger.debug("Refreshing credentials")
                 await event_emitter.progress_update("Refreshing credentials...")
-                creds.refresh(Request())
+                await asyncio.to_thread(creds.refresh, Request(session=_google_http))
             except Exception as e:
-                # Log error for debugging purposes
-                print(
-                    f"\n\n*** Error refreshing token from {token_file_path}: {e}. Need to re-authenticate.***\n\n"
+                _creds_cache.pop(token_file_path, None)
+                logger.warning(
+                    "Error refreshing token from %s: %s. Need to re-authenticate.", token_file_path, e
                 )
                 await event_emitter.error_update(
                     f"Error refreshing token from {token_file_path}: {e}. Need to re-authenticate."
                 )
                 # Remove potentially corrupt token file if refresh fails
-                if os.path.exists(token_file_path):
-                    os.remove(token_file_path)
+                try:
+                    await asyncio.to_thread(os.remove, token_file_path)
+                except FileNotFoundError:
+                    pass
                 creds = None
         else:
 
             try:
-                print("\n\n*** Attempting to authenticate with Google via login flow ... ***\n\n")
+                logger.debug("Authenticating with Google via login flow")
                 await event_emitter.progress_update("Authenticating with Google via login flow...")
                 # If there are no (valid) credentials available, let the user log in.
                 # Use the InstalledAppFlow to authenticate
-                print("\n\n*** Creating InstalledAppFlow ... ***\n\n")
                 await event_emitter.progress_update("Creating InstalledAppFlow...")
-                client_config = json.loads(credentials_json_string)
+                client_config = _json_loads(credentials_json_string)
                 # Attempt to run the local server flow
                 try:
                     flow = InstalledAppFlow.from_client_config(client_config, scopes)
                     flow.redirect_uri = "http://localhost:8080/oauth/google/callback/"
                     await event_emitter.progress_update("Flow Created...")
                 except Exception as e:
-                    print(f"\n\n*** FLOW ERRROR!!!!\n{e}\n")
+                    logger.error("Failed to create InstalledAppFlow: %s", e)
                     await event_emitter.error_update(f"\n\n*** ERRROR!!!!\n{e}\n")
 
-                print("\n\n*** Running local server to finish flow ***\n\n")
                 await event_emitter.progress_update("Running local server to finish flow")
                 # Set prompt=consent to ensure refresh token is issued the first time
 
-                print(f"*** Flow Redirect URI: {flow.redirect_uri}***")
                 auth_url = flow.authorization_url()
-                print(f"*** Auth URL: {auth_url[0]}***")
+                logger.debug("Flow redirect URI: %s, auth URL: %s", flow.redirect_uri, auth_url[0])
 
-                flow.run_local_server(port=0, open_browser=False)
+                await asyncio.to_thread(flow.run_local_server, port=0, open_browser=False)
 
                 await event_emitter.message_update(auth_url[0])
-                print(f"*** Flow Authorization URL: {auth_url}***")
                 #user_confirmation = await __event_call__(
                 #    {
                 #        "type": "confirmation",
@@ -131,44 +242,76 @@ async def authenticate_with_google(
                 #print(f"\n\n***User Confirmation: ***\n{user_confirmation}\n")
                 creds = flow.credentials
 
-                print("\n\n*** Successfully authenticated with Google ***\n{creds}\n")
+                logger.debug("Successfully authenticated with Google")
                 await event_emitter.success_update(
                     "Successfully authenticated with Google Calendar API."
                 )
             except Exception as e:
-                print(f"\n\n*** Google Authentication flow failed ***\n{e}\n")
+                logger.error("Google authentication flow failed: %s", e)
                 await event_emitter.error_update(f"\n\n*** Google Authentication flow failed ***\n{e}\n")
                 raise Exception(f"\n\n*** FAILED TO AUTHENTICATE WITH GOOGLE ***\n{e}\n")
 
         # Save the credentials for the next run
         if creds and creds.valid:
             try:
-                with open(token_file_path, "w") as token:
-                    token.write(creds.to_json())
+                await asyncio.to_thread(_write_token_file, token_file_path, creds)
             except Exception as e:
                 await event_emitter.error_update(
                     f"Could not save token file {token_file_path}: {e}"
                 )
-                print(f"\n\n*** Look out ! Could not save token file !! ***\n{e}\n")
+                logger.error("Could not save token file %s: %s", token_file_path, e)
                 raise Exception(f"\n\n*** Look out ! Could not save token file !! ***\n{e}\n")
     # Save the credentials for the next run
     if creds and creds.valid:
+        _creds_cache[token_file_path] = creds
+        _maybe_background_refresh(creds, token_file_path)
         await event_emitter.success_update(
             f"Credentials are valid and saved to {token_file_path}."
         )
         return creds
-    print(f"\n\n*** Authentication Failed ***\n{creds}")
+    logger.error("Authentication failed")
 
     raise Exception(f"***Authentication Failure: Failed to Authenticate with Google \n{creds}***")
 
-def get_geocoords(api_key: str, country: str, zipcode: str) -> dict:
-    print("Getting Geo Coordintes for weather look up")
-    url = f"http://api.openweathermap.org/geo/1.0/zip?zip={zipcode},{country}&appid={api_key}"
-    resp = requests.get(url)
-    print(f"Coords Response: {resp.status_code}")
-    if resp.status_code == 200:
-        return resp.json()
-    return {}
+def _describe_error(e: Exception) -> str:
+    """Summarize a request failure without the request URL (it carries the API key)."""
+    if isinstance(e, aiohttp.ClientResponseError):
+        return f"{e.status} - {e.message}"
+    return str(e) or repr(e)
+
+@asynccontextmanager
+async def _weather_lock(key: tuple[float, float]):
+    """Hold the fetch lock for key, dropping it once no other caller needs it."""
+    lock, users = _weather_locks.get(key) or (asyncio.Lock(), 0)
+    _weather_locks[key] = (lock, users + 1)
+    try:
+        async with lock:
+            yield
+    finally:
+        lock, users = _weather_locks[key]
+        if users == 1:
+            del _weather_locks[key]
+        else:
+            _weather_locks[key] = (lock, users - 1)
+
+async def get_geocoords(session: aiohttp.ClientSession, api_key: str, country: str, zipcode: str) -> dict:
+    key = (country, zipcode)
+    entry = _geo_cache.get(key)
+    if entry and entry[1] > time.monotonic():
+        _geo_cache.move_to_end(key)
+        return entry[0]
+    logger.debug("Getting geo coordinates for %s, %s", zipcode, country)
+    params = {"zip": f"{zipcode},{country}", "appid": api_key}
+    async with session.get(OWM_GEO, params=params) as resp:
+        logger.debug("Coords response: %s", resp.status)
+        if resp.status != 200:
+            return {}
+        coords = await resp.json(loads=_json_loads)
+    _geo_cache[key] = (coords, time.monotonic() + _GEO_CACHE_TTL)
+    _geo_cache.move_to_end(key)
+    if len(_geo_cache) > _GEO_CACHE_MAX:
+        _geo_cache.popitem(last=False)
+    return coords
 
 class Equation(BaseModel):
     equation: str = Field(..., description="The mathematical equation to calculate.")
@@ -178,38 +321,103 @@ class City(BaseModel):
         "Bothell, Wa", description="Get the current weather for a given city."
     )
 
+class _EventChannel:
+    """Queue of (emitter, event) pairs delivered in order by a single drain task."""
+
+    def __init__(self):
+        self._q: asyncio.Queue = asyncio.Queue(maxsize=256)
+        self._worker: asyncio.Task | None = None
+
+    async def flush(self):
+        """Wait until every queued event has been delivered."""
+        if self._worker is not None:
+            # Shielded so a cancelled caller doesn't cancel the shared drain task
+            await asyncio.shield(self._worker)
+
+    async def put(self, ee: Callable[[dict], Any], event: dict):
+        await self._q.put((ee, event))
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._drain())
+
+    async def _drain(self):
+        while not self._q.empty():
+            batch = []
+            while not self._q.empty():
+                batch.append(self._q.get_nowait())
+            for ee, event in self._coalesce(batch):
+                try:
+                    await ee(event)
+                except Exception:
+                    logger.exception("Failed to deliver event %s", event.get("type"))
+
+    @staticmethod
+    def _coalesce(batch: List[tuple]) -> List[tuple]:
+        """Drop in-progress statuses that are immediately superseded by another status to the same emitter."""
+        pending = []
+        for ee, event in batch:
+            if pending:
+                last_ee, last = pending[-1]
+                if (
+                    last_ee is ee
+                    and event["type"] == "status"
+                    and last["type"] == "status"
+                    and not last["data"].get("done")
+                ):
+                    pending[-1] = (ee, event)
+                    continue
+            pending.append((ee, event))
+        return pending
+
+
 class EventEmitter:
     def __init__(self, event_emitter: Callable[[dict], Any] = None, call_emitter: Callable[[dict], Any] = None):
         
         self.event_emitter = event_emitter
-        print("\n\n*** Emitter initiated  ***\n\n")
+        self._channel = _EventChannel()
+        logger.debug("Emitter initiated")
+
+    def rebind(self, event_emitter: Callable[[dict], Any] = None) -> "EventEmitter":
+        """Return an emitter for the current call's event emitter with its own queue.
+
+        Tools instances are shared between users, so a slow or stuck emitter
+        must not hold up delivery or flush() for any other call.
+        """
+        return EventEmitter(event_emitter)
 
     async def progress_update(self, description: str):
         """Emit a progress update."""
-        print(f"\n\n*** Emitting progress update: {description}  ***\n\n")
+        if self.event_emitter is None:
+            return
+        logger.debug("Emitting progress update: %s", description)
         await self.emit(description)
 
     async def error_update(self, description: str):
         """Emit an error update and mark as done."""
-        print(f"\n\n*** Emitting error!!: {description}  ***\n\n")
+        if self.event_emitter is None:
+            return
+        logger.debug("Emitting error: %s", description)
         await self.emit(description, "error", True)
+        await self.flush()
 
     async def message_update(self, content: str):
         """Emit a message update."""
-        print(f"\n\n*** Emitting message: {content}  ***\n\n")
+        if self.event_emitter is None:
+            return
+        logger.debug("Emitting message: %s", content)
         event_data = {
             "type": "chat:message:delta",
             "data": {
                 "content": content,
             }
         }
-        if self.event_emitter:
-            await self.event_emitter(event_data)
+        await self._enqueue(event_data)
 
 
     async def success_update(self, description: str, data: Any = None):
         """Emit a success update and mark as done."""
-        print(f"\n\n*** Emitting Success: {description}  ***\n\n")
+        if self.event_emitter is None:
+            return
+        logger.debug("Emitting success: %s", description)
         event_data = {
             "type": "notification",
             "data": {
@@ -220,8 +428,8 @@ class EventEmitter:
         if data is not None:  # Allow empty dicts/lists as valid data
             event_data["data"]["details"] = data
 
-        if self.event_emitter:
-            await self.event_emitter(event_data)
+        await self._enqueue(event_data)
+        await self.flush()
 
     async def emit(
         self,
@@ -231,19 +439,28 @@ class EventEmitter:
         type: str = "status",
     ):
         """Emit a generic status update."""
-        print(f"***Emitting message: {description}***")
-        if self.event_emitter:
-            await self.event_emitter(
-                {
-                    "type": type,   # Type of event, e.g., "status", "notification", etc.
-                    "data": {
-                        "status": status,
-                        "description": description,
-                        "done": done,
-                        "hidden": False,
-                    },
-                }
-            )
+        if self.event_emitter is None:
+            return
+        await self._enqueue(
+            {
+                "type": type,   # Type of event, e.g., "status", "notification", etc.
+                "data": {
+                    "status": status,
+                    "description": description,
+                    "done": done,
+                    "hidden": False,
+                },
+            }
+        )
+
+    async def flush(self):
+        """Wait until every queued event has been delivered."""
+        await self._channel.flush()
+
+    async def _enqueue(self, event: dict):
+        # The target is captured with the event, so other calls can't redirect it
+        await self._channel.put(self.event_emitter, event)
+
 
 class Tools:
 
@@ -269,14 +486,38 @@ class Tools:
     def __init__(self, __event_emitter__: dict = {}, __event_call__: Callable[[dict], Any] = None):
         self.valves = self.Valves()
         self.token_file = "token.json"  # Use a specific token file
+        # Created lazily so the session binds to the loop that runs the tools
+        self._http: aiohttp.ClientSession | None = None
+        # Built Google API clients keyed by (api, version), with the creds they wrap
+        self._service_cache: dict[tuple[str, str], tuple[Any, Any]] = {}
         
-        if callable(__event_emitter__) and callable(__event_call__):
-            self.emitter = EventEmitter(__event_emitter__, __event_call__)
-        else:
-            self.emitter = EventEmitter(lambda event: print(f"Event: {event}"), lambda event: asyncio.sleep(1))
+        # Each tool call rebinds this to its own __event_emitter__
+        self.emitter = EventEmitter()
+
+    def _get_http(self) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, creating it on first use."""
+        if self._http is None or self._http.closed:
+            self._http = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=5))
+        return self._http
+
+    async def _get_service(self, api: str, version: str, creds):
+        """Return a Google API client for creds, building it only when needed."""
+        cached = self._service_cache.get((api, version))
+        if cached is not None and cached[0] is creds:
+            return cached[1]
+        # The in-memory cache replaces googleapiclient's file-backed discovery cache
+        service = await asyncio.to_thread(
+            build, api, version, credentials=creds, cache_discovery=False
+        )
+        self._service_cache[(api, version)] = (creds, service)
+        return service
 
+    async def aclose(self):
+        """Close the shared HTTP session."""
+        if self._http is not None and not self._http.closed:
+            await self._http.close()
+        self._http = None
 
-        
     # Add your custom tools using pure Python code here, make sure to add type hints and descriptions
 
     async def example_tool(self, __event_emitter__: Callable[[dict], Any] = None, __event_call__: Callable[[dict], Any] = None) -> str:
@@ -318,26 +559,25 @@ class Tools:
         """
         Get the user name, Email and ID from the user object.
         """
-        event_emitter = EventEmitter(__event_emitter__)
+        event_emitter = self.emitter.rebind(__event_emitter__)
         # Do not include a descrption for __user__ as it should not be shown in the tool's specification
         # The session user object will be passed as a parameter when the function is called
 
-        print(f"\n\n*** USER!!{__user__} ***\n\n")
+        logger.debug("User: %s", __user__)
+        name = __user__.get("name")
+        uid = __user__.get("id")
+        email = __user__.get("email")
         await event_emitter.progress_update(
-            f"Found :User {__user__['name']}, Email: {__user__['email']}"
+            f"Found :User {name}, Email: {email}"
         )
-        # This is bad from and I cant stand it.
-        result = ""
-
-        if "name" in __user__:
-            result += f"User: {__user__['name']}"
-        if "id" in __user__:
-            result += f" (ID: {__user__['id']})"
-        if "email" in __user__:
-            result += f" (Email: {__user__['email']})"
-
-        if result == "":
-            result = "User: Unknown"
+        parts = []
+        if name:
+            parts.append(f"User: {name}")
+        if uid:
+            parts.append(f"(ID: {uid})")
+        if email:
+            parts.append(f"(Email: {email})")
+        result = " ".join(parts) or "User: Unknown"
 
         await event_emitter.success_update(
             f"Found User: {result}"
@@ -348,111 +588,123 @@ class Tools:
         """
         Get the current time in a more human-readable format.
         """
-        print("\n\n*** Getting Time ***\n\n")
-        event_emitter = EventEmitter(__event_emitter__)
+        event_emitter = self.emitter.rebind(__event_emitter__)
         await event_emitter.progress_update("Fetching current time...")
-        now = dt.now()
-        current_time = now.strftime("%I:%M:%S %p")  # Using 12-hour format with AM/PM
-        current_date = now.strftime(
-            "%A, %B %d, %Y"
-        )  # Full weekday, month name, day, and year
-        print(f"Current Date and Time = {current_date}, {current_time}")
-        await event_emitter.success_update(
-            f"Current Date and Time = {current_date}, {current_time}"
-        )
-        return f"Current Date and Time = {current_date}, {current_time}"
+        result = f"Current Date and Time = {dt.now().strftime(_TIME_FMT)}"
+        await event_emitter.success_update(result)
+        return result
 
     async def get_current_weather(self, __event_emitter__: Callable[[dict], Any] = None, __event_call__: Callable[[dict], Any] = None) -> str:
         """Get the current weather for a given zipcode."""
-        print("\n\n***GETTING CURRENT WEATHER***\n\n")
+        logger.debug("Getting current weather")
         
-        event_emitter = EventEmitter(__event_emitter__)
-        await event_emitter.progress_update("Fetching current weather...")
+        event_emitter = self.emitter.rebind(__event_emitter__)
         """Get geocoords first"""
 
         try:
-
-            zipcode = await __event_call__(
-                {
-                    "type": "input",
-                    "data": {
-                        "title": "Zipcode",
-                        "message": "Please enter the Zipcode  (e.g., (98012))",
-                        "placeholder": "Zipcode",
-                    },
-                }
-            )
-            coords = get_geocoords(self.valves.api_key, "US", zipcode)
-            await event_emitter.progress_update(
-                f"Found Geolocation coordinates LAT: {coords['lat']}, LONG: {coords['lon']} "
-            )
-            print(
-                f"\n\n*** COORDS: LAT: {coords['lat']}, LONG: {coords['lon']} ***\n\n"
-            )
-        except Exception as e:
-            print(
-                f"***ERROR: There was an error retieving Coordinates for the location *** \n{e}\n"
-            )
-            return f"Error retrieving coordinates: {str(e)}"
-
-        await event_emitter.progress_update(
-            f"Fetching weather data for coordinates: LAT: {coords['lat']}, LONG: {coords['lon']}"
-        )
-
-        try:
-            weather_url = f"https://api.openweathermap.org/data/2.5/weather?lat={coords['lat']}&lon={coords['lon']}&appid={self.valves.api_key}"
-            response = requests.get(weather_url)
-            response.raise_for_status()  # Raise HTTPError for bad responses (4xx and 5xx)
-            data = response.json()
-            print(f"\n\n***CURRENT WEATHER***\n{data}\n")
-            await event_emitter.progress_update(
-                f"Received weather data for {zipcode}."
-            )
-            if data.get("cod") != 200:
-                await event_emitter.error_update(
-                    f"Error fetching weather data: {data.get('message')}"
+            try:
+                # The status is only queued here, so the prompt isn't held up by it
+                await event_emitter.progress_update("Fetching current weather...")
+                zipcode = await __event_call__(
+                    {
+                        "type": "input",
+                        "data": {
+                            "title": "Zipcode",
+                            "message": "Please enter the Zipcode  (e.g., (98012))",
+                            "placeholder": "Zipcode",
+                        },
+                    }
                 )
-                return f"Error fetching weather data: {data.get('message')}"
-
-            weather_description = data["weather"][0]["description"]
-            temperature = float(data["main"]["temp"]) - float(273.15)
-            humidity = data["main"]["humidity"]
-            wind_speed = data["wind"]["speed"]
-            await event_emitter.success_update(
-                f"Found Weather data for {zipcode}: {data['weather'][0]['description']}"
-            ) 
-            return f"Weather in {zipcode}: {weather_description}, Temp: {temperature}, Humidity: {humidity}, WindSpeed: {wind_speed}°C"
-        except requests.RequestException as e:
-            await event_emitter.error_update(
-                f"Error fetching weather data: {str(e)}"
-            )
-            return f"Error fetching weather data: {str(e)}"
+                coords_task = asyncio.create_task(
+                    get_geocoords(self._get_http(), self.valves.api_key, "US", zipcode)
+                )
+                coords, _ = await asyncio.gather(
+                    coords_task,
+                    event_emitter.progress_update(f"Fetching Geolocation coordinates for {zipcode}..."),
+                )
+                logger.debug("Coords: LAT: %s, LONG: %s", coords["lat"], coords["lon"])
+            except Exception as e:
+                logger.error("Error retrieving coordinates for the location: %s", _describe_error(e))
+                await event_emitter.error_update(f"Error retrieving coordinates: {_describe_error(e)}")
+                return f"Error retrieving coordinates: {_describe_error(e)}"
 
-    def get_geolocation_and_public_ip(self) -> dict:
-        url = "https://api.ipify.org?format=json"
-        try:
-            response = requests.get(url)
-            if response.status_code == 200:
-                json_data = response.json()
-                print(
-                    f"\n\n***DEBUG GEOLOCATION PUBLIC IP API JSON RESPONSE ***\n{json_data}\n"
+            try:
+                # Start the weather request, then report progress while it is in flight
+                weather_task = asyncio.create_task(
+                    self._fetch_weather(coords["lat"], coords["lon"])
+                )
+                data, *_ = await asyncio.gather(
+                    weather_task,
+                    *[
+                        event_emitter.progress_update(m)
+                        for m in (
+                            f"Found Geolocation coordinates LAT: {coords['lat']}, LONG: {coords['lon']} ",
+                            f"Fetching weather data for coordinates: LAT: {coords['lat']}, LONG: {coords['lon']}",
+                        )
+                    ],
+                )
+                logger.debug("Current weather: %s", data)
+                await event_emitter.progress_update(
+                    f"Received weather data for {zipcode}."
                 )
-                public_ip = json_data["ip"]
-                print(f"Public IP: {public_ip}")
-                print("Retrieving geolocation data...")
-                response = requests.get(
-                    f"https://geo.ipify.org/json?ipAddress={public_ip}"
+                if data.get("cod") != 200:
+                    await event_emitter.error_update(
+                        f"Error fetching weather data: {data.get('message')}"
+                    )
+                    return f"Error fetching weather data: {data.get('message')}"
+
+                main = data["main"]
+                weather_description = data["weather"][0]["description"]
+                temperature = main["temp"] - 273.15
+                humidity = main["humidity"]
+                wind_speed = data["wind"]["speed"]
+                await event_emitter.success_update(
+                    f"Found Weather data for {zipcode}: {weather_description}"
                 )
-                if response.status_code == 200:
-                    json_data = response.json()
-                    print(json_data)
+                return f"Weather in {zipcode}: {weather_description}, Temp: {temperature}, Humidity: {humidity}, WindSpeed: {wind_speed}°C"
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                message = f"Error fetching weather data: {_describe_error(e)}"
+                await event_emitter.error_update(message)
+                return message
+        finally:
+            # Deliver everything queued before returning, whichever path exits
+            await event_emitter.flush()
+
+    async def _fetch_weather(self, lat: float, lon: float) -> dict:
+        """Fetch the current weather JSON for a pair of coordinates."""
+        key = (round(lat, 2), round(lon, 2))
+        entry = _weather_cache.get(key)
+        if entry and entry[1] > time.monotonic():
+            _weather_cache.move_to_end(key)
+            return entry[0]
+        async with _weather_lock(key):
+            # Another caller may have fetched it while we waited
+            entry = _weather_cache.get(key)
+            if entry and entry[1] > time.monotonic():
+                _weather_cache.move_to_end(key)
+                return entry[0]
+            params = {"lat": lat, "lon": lon, "appid": self.valves.api_key}
+            async with self._get_http().get(OWM_WEATHER, params=params) as response:
+                response.raise_for_status()  # Raise ClientResponseError for bad responses (4xx and 5xx)
+                data = await response.json(loads=_json_loads)
+            _weather_cache[key] = (data, time.monotonic() + _WEATHER_CACHE_TTL)
+            _weather_cache.move_to_end(key)
+            if len(_weather_cache) > _WEATHER_CACHE_MAX:
+                _weather_cache.popitem(last=False)
+            return data
+
+    async def get_geolocation_and_public_ip(self) -> dict:
+        # Without ipAddress the geolocation service resolves the caller's own
+        # public IP, so a separate api.ipify.org round-trip is unnecessary
+        try:
+            async with self._get_http().get(IPIFY_GEO) as response:
+                if response.status == 200:
+                    json_data = await response.json(loads=_json_loads)
+                    logger.debug("Geolocation: %s", json_data)
                     return json_data
-                else:
-                    print(f"Failed to retrieve data: {response.status_code}")
-            else:
-                print(f"Failed to retrieve data: {response.status_code}")
-        except requests.exceptions.RequestException as e:
-            print(f"An error occurred: {e}")
+                logger.warning("Failed to retrieve geolocation: %s", response.status)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error("Geolocation lookup failed: %s", e)
         return {}
 
     async def get_my_calandar(self, __event_emitter__: Callable[[dict], Any] = None, __event_call__: Callable[[dict], Any] = None) -> dict:
@@ -460,85 +712,106 @@ class Tools:
         Shows basic usage of the Google Calendar API.
         Prints the start and name of the next 10 events on the user's calendar.
         """
-        event_emitter = EventEmitter(__event_emitter__)
+        event_emitter = self.emitter.rebind(__event_emitter__)
         SCOPES = ["https://www.googleapis.com/auth/calendar.readonly"]
 
-        await event_emitter.progress_update("Getting calendar events from Google Calendar API...")
-        # TODO: Add your Google API credentials here or load them from a secure location
-        secret_stuff = """ """
-        
-
         try:
-            creds = await authenticate_with_google(SCOPES, secret_stuff, self.token_file, __event_emitter__)
-        except Exception as e:
-            print(f"\n\n***ERROR authenticating with Google Calendar API... ***\n{e}\n")
-            await event_emitter.error_update(
-                f"Error authenticating with Google Calendar API: {e}"
-            )
-            return {}
-        
-        await event_emitter.progress_update("Authenticated with Google Calendar API...")
-        print(f"\n\n*** Authenticated with Google Calendar API... ***\n{creds}\n")
+            await event_emitter.progress_update("Getting calendar events from Google Calendar API...")
+            # TODO: Add your Google API credentials here or load them from a secure location
+            secret_stuff = """ """
+
 
-        try:
-            print("\n\n*** Setting up service ....***\n\n")
-            await event_emitter.progress_update("Setting up Google Calendar service...")
             try:
-                service = build("calendar", "v3", credentials=creds)
-                print("\n\n*** Service setup is complete ....***\n\n")
-                await event_emitter.progress_update(
-                    "Google Calendar service setup complete."
-                )
-                await event_emitter.progress_update("Getting upcoming events from Google Calendar...")
+                creds = await authenticate_with_google(SCOPES, secret_stuff, self.token_file, event_emitter)
             except Exception as e:
-                print(f"\n\n***ERROR setting up service ... ***\n{e}\n")
-                return {}
-            # Call the Calendar API
-            now = dt.now(tz=datetime.timezone.utc).isoformat()
-            print("\n\n*** Getting the upcoming 10 events ***\n\n")
-            await event_emitter.progress_update(
-                "Getting the upcoming 10 events..."
-            )
-            events_result = (
-                service.events()
-                .list(
-                    calendarId="primary",
-                    timeMin=now,
-                    maxResults=10,
-                    singleEvents=True,
-                    orderBy="startTime",
+                logger.error("Error authenticating with Google Calendar API: %s", e)
+                await event_emitter.error_update(
+                    f"Error authenticating with Google Calendar API: {e}"
                 )
-                .execute()
-            )
-            events = events_result.get("items", [])
-            print(f"\n\n*** EVENTS: ***\n{events}")
-            await event_emitter.progress_update(
-                f"Retrieved {len(events)} upcoming events from Google Calendar."
-            )
-            if not events:
-                print("No upcoming events found.")
-                await event_emitter.error_update("No upcoming events found.")
                 return {}
 
-            # Prints the start and name of the next 10 events
-            for event in events:
-                start = event["start"].get("dateTime", event["start"].get("date"))
-                await event_emitter.message_update(
-                    f"Upcoming event: {start} - {event['summary']}"
+            await event_emitter.progress_update("Authenticated with Google Calendar API...")
+
+            try:
+                await event_emitter.progress_update("Setting up Google Calendar service...")
+                try:
+                    service = await self._get_service("calendar", "v3", creds)
+                    await event_emitter.progress_update(
+                        "Google Calendar service setup complete."
+                    )
+                    await event_emitter.progress_update("Getting upcoming events from Google Calendar...")
+                except Exception as e:
+                    logger.error("Error setting up Google Calendar service: %s", e)
+                    await event_emitter.error_update(f"Error setting up Google Calendar service: {e}")
+                    return {}
+                # Call the Calendar API
+                now = dt.now(tz=datetime.timezone.utc).isoformat()
+                await event_emitter.progress_update(
+                    "Getting the upcoming 10 events..."
+                )
+                events_result = (
+                    service.events()
+                    .list(
+                        calendarId="primary",
+                        timeMin=now,
+                        maxResults=10,
+                        singleEvents=True,
+                        orderBy="startTime",
+                    )
+                    .execute()
                 )
-                print(start, event["summary"])
+                events = events_result.get("items", [])
+                logger.debug("Events: %s", events)
+                await event_emitter.progress_update(
+                    f"Retrieved {len(events)} upcoming events from Google Calendar."
+                )
+                if not events:
+                    await event_emitter.error_update("No upcoming events found.")
+                    return {}
+
+                # Prints the start and name of the next 10 events
+                for event in events:
+                    start = event["start"].get("dateTime", event["start"].get("date"))
+                    await event_emitter.message_update(
+                        f"Upcoming event: {start} - {event['summary']}"
+                    )
+
+                await event_emitter.success_update("Retrieved upcoming events from Google Calendar.")
+
+            except HttpError as error:
+                logger.error("Google Calendar API error: %s", error)
+                await event_emitter.error_update(f"Google Calendar API error: {error}")
+            return {}
+        finally:
+            # Deliver everything queued before returning, whichever path exits
+            await event_emitter.flush()
 
-            await event_emitter.success_update("Retrieved upcoming events from Google Calendar.")
 
-        except HttpError as error:
-            print(f"An error occurred: {error}")
-        return {}
+def _install_fast_event_loop():
+    """Use uvloop for standalone runs when it is installed."""
+    try:
+        import uvloop
+    except ImportError:
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
 
 
-if __name__ == "__main__":
+async def _main():
+    async def prompt(event: dict):
+        return await asyncio.to_thread(input, f"{event['data']['message']}: ")
+
     tools = Tools()
-    print(tools.get_current_time())
-    print(tools.get_current_weather())
-    print(tools.get_geolocation_and_public_ip())
-    asyncio.run(tools.get_my_calandar())
+    try:
+        print(await tools.get_current_time())
+        print(await tools.get_current_weather(__event_call__=prompt))
+        print(await tools.get_geolocation_and_public_ip())
+        await tools.get_my_calandar()
+    finally:
+        await tools.aclose()
+
+
+if __name__ == "__main__":
+    configure_logging(filename='dev_vendor_parser.log')
+    _install_fast_event_loop()
+    asyncio.run(_main())
     
\ No newline at end of file
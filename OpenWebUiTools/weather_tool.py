@@ -1,73 +1,221 @@
 import os
-import requests
+import asyncio
+import aiohttp
+import atexit
+import json
 import logging
+import random
+import time
 
+from collections import OrderedDict
 from typing import Any, Callable, List
 
 from pydantic import BaseModel, Field
 
-numeric_log_level = getattr(logging, "DEBUG", None)
-if not isinstance(numeric_log_level, int):
-    raise ValueError('Invalid log level: %s' % "DEBUG")
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    _json_loads = json.loads
 
-# Set up logging
+# Logging is configured by the host application (e.g. Open WebUI). For file
+# logging in a standalone run, call logging.basicConfig once at the entry point:
+#   logging.basicConfig(filename='WeatherToolLog.log', level=logging.DEBUG)
 logger = logging.getLogger(__name__)
-logging.basicConfig(
+logger.addHandler(logging.NullHandler())
 
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    filename='WeatherToolLog.log', 
-    encoding='utf-8', 
-    level=numeric_log_level
-)
+# Shared across Tools instances, which Open WebUI builds per invocation, so the
+# connection pool and DNS cache outlive a single tool call. Created lazily
+# inside the running event loop and rebuilt if a different loop asks for it
+# (e.g. successive asyncio.run calls), since a session can't outlive its loop.
+_session: aiohttp.ClientSession | None = None
+_session_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _session_usable(loop: asyncio.AbstractEventLoop) -> bool:
+    return _session is not None and not _session.closed and _session_loop is loop
+
+
+async def _close_stale_session(session: aiohttp.ClientSession, loop: asyncio.AbstractEventLoop):
+    """Close a session left behind by another event loop."""
+    if loop.is_closed():
+        # The connector can't touch transports of a closed loop, so this only
+        # marks the session and connector closed and awaits nothing on that loop
+        await session.close()
+    else:
+        # Its loop is still alive elsewhere and must do the close itself
+        session.detach()
+
+
+async def _get_session() -> aiohttp.ClientSession:
+    """Return the shared HTTP session for the running loop, creating it on first use."""
+    global _session, _session_loop
+    loop = asyncio.get_running_loop()
+    # No await between the check and the assignment, so concurrent callers on
+    # this loop can't both build a session
+    if not _session_usable(loop):
+        stale, stale_loop = _session, _session_loop
+        _session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=10),
+            # Keep idle connections past aiohttp's 15s default so the TLS
+            # connection to OpenWeatherMap survives between chat turns
+            connector=aiohttp.TCPConnector(
+                limit=20, limit_per_host=10, ttl_dns_cache=300, keepalive_timeout=60
+            ),
+        )
+        _session_loop = loop
+        if stale is not None and not stale.closed:
+            logger.debug("Replacing HTTP session bound to a previous event loop")
+            await _close_stale_session(stale, stale_loop)
+    return _session
+
+
+@atexit.register
+def _close_session():
+    """Close the shared session if its event loop is still usable.
+
+    This only helps when the loop is left open at exit (e.g. a host that
+    drives its own long-lived loop). Under asyncio.run the loop is already
+    closed by then and this does nothing, so standalone callers should
+    await Tools.close() before their loop ends.
+    """
+    if _session is None or _session.closed or _session_loop is None:
+        return
+    if _session_loop.is_closed() or _session_loop.is_running():
+        return
+    _session_loop.run_until_complete(_session.close())
+
+
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Query strings (including the API key) are passed as params= so they are
+# URL-encoded by aiohttp and never pasted into URLs we log or show
+_GEO_URL = "http://api.openweathermap.org/geo/1.0/zip"
+_WEATHER_URL = "https://api.openweathermap.org/{endpoint}"
+# Read once; the environment doesn't change while the tool server runs
+_FORECAST_API_KEY = os.getenv("WEATHER_API_KEY")
+
+
+def _describe_error(e: Exception) -> str:
+    """Summarize a request failure without the request URL (it carries the API key)."""
+    if isinstance(e, aiohttp.ClientResponseError):
+        return f"{e.status} - {e.message}"
+    return str(e) or repr(e)
+
+
+async def _get_json(url: str, params: dict | None = None, attempts: int = 4) -> dict:
+    """GET a JSON endpoint, retrying transient failures with exponential backoff."""
+    session = await _get_session()
+    for attempt in range(attempts):
+        delay = 0.3 * 2 ** attempt + random.random() * 0.1
+        try:
+            async with session.get(url, params=params) as response:
+                if response.status in _RETRY_STATUSES and attempt < attempts - 1:
+                    retry_after = response.headers.get("Retry-After", "")
+                    if retry_after.isdigit():
+                        delay = min(float(retry_after), 10.0)
+                    logger.warning("GET returned %s, retrying in %.2fs", response.status, delay)
+                else:
+                    response.raise_for_status()  # Raise ClientResponseError for bad responses (4xx and 5xx)
+                    return await response.json(loads=_json_loads)
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+            if attempt == attempts - 1:
+                raise
+            logger.warning("GET failed (%s), retrying in %.2fs", _describe_error(e), delay)
+        await asyncio.sleep(delay)
+
+
+# Zip -> lat/lon is effectively static; weather only needs to be fresh-ish.
+# Entries are (expires_at, json); expired entries are kept as a stale fallback
+# for up to *_STALE_MAX past expiry, and each cache is LRU-bounded.
+_GEO_CACHE_TTL = 30 * 86400
+_GEO_STALE_MAX = 30 * 86400
+_WEATHER_CACHE_TTL = 120
+_WEATHER_STALE_MAX = 3600
+_CACHE_MAX = 1024
+_geo_cache: OrderedDict[tuple[str, str], tuple[float, dict]] = OrderedDict()
+_weather_cache: OrderedDict[tuple, tuple[float, dict]] = OrderedDict()
+
+
+def _cache_get(cache: OrderedDict, key: tuple, stale_max: float) -> tuple[float, dict] | None:
+    """Return the (expires_at, json) entry for key, evicting it if too stale to fall back on."""
+    entry = cache.get(key)
+    if entry is None:
+        return None
+    if time.monotonic() - entry[0] > stale_max:
+        del cache[key]
+        return None
+    cache.move_to_end(key)
+    return entry
+
+
+def _cache_put(cache: OrderedDict, key: tuple, ttl: float, data: dict):
+    cache[key] = (time.monotonic() + ttl, data)
+    cache.move_to_end(key)
+    if len(cache) > _CACHE_MAX:
+        cache.popitem(last=False)
+
+
+async def _get_weather_json(url: str, params: dict, key: tuple) -> dict:
+    """GET a weather endpoint, reusing a cached response for the same place."""
+    entry = _cache_get(_weather_cache, key, _WEATHER_STALE_MAX)
+    if entry and time.monotonic() < entry[0]:
+        return entry[1]
+    try:
+        data = await _get_json(url, params)
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        if entry is None:
+            raise
+        logger.warning("Weather request failed, serving cached response: %s", _describe_error(e))
+        return entry[1]
+    _cache_put(_weather_cache, key, _WEATHER_CACHE_TTL, data)
+    return data
 
 
 class EventEmitter:
+    # Fixed parts of each payload; per-call fields are filled into a fresh copy
+    # because the host may keep a reference to the dict it receives
+    _STATUS_DATA = {"status": "in_progress", "description": "", "done": False, "hidden": False}
+    _NOTIFICATION_DATA = {"type": "info", "content": ""}
+
     def __init__(self,  event_emitter: Callable[[dict], Any] = None, call_emitter: Callable[[dict], Any] = None):
-        
-        logger.info("Initializing EventEmitter")
-        if not callable(event_emitter):
-            raise ValueError("event_emitter must be a callable function.")
         self.event_emitter = event_emitter
-        logger.info("\n\n*** Emitter initiated  ***\n\n")
+        # Bound once so each emit reads a single attribute
+        self._emit = event_emitter
+        logger.debug("Emitter initiated")
 
     async def progress_update(self, description: str):
         """Emit a progress update."""
-        logger.info(f"\n\n*** Emitting progress update: {description}  ***\n\n")
+        if self._emit is None:
+            return
+        logger.debug("Emitting progress update: %s", description)
         await self.emit(description)
 
     async def error_update(self, description: str):
         """Emit an error update and mark as done."""
-        logger.error(f"\n\n*** Emitting error!!: {description}  ***\n\n")
+        if self._emit is None:
+            return
+        logger.error("Emitting error: %s", description)
         await self.emit(description, "error", True)
 
     async def message_update(self, content: str):
         """Emit a message update."""
-        logger.info(f"\n\n*** Sending message To frontend: {content}  ***\n\n")
-        event_data = {
-            "type": "chat:message:delta",
-            "data": {
-                "content": content,
-            }
-        }
-        if self.event_emitter:
-            await self.event_emitter(event_data)
+        if self._emit is None:
+            return
+        logger.debug("Sending message to frontend: %s", content)
+        await self._emit({"type": "chat:message:delta", "data": {"content": content}})
 
 
     async def success_update(self, description: str, data: Any = None):
         """Emit a success update and mark as done."""
-        logger.info(f"\n\n***Success!: {description}  ***\n\n")
-        event_data = {
-            "type": "notification",
-            "data": {
-                "type": "info",
-                "content": description,
-            }
-        }
+        if self._emit is None:
+            return
+        logger.debug("Success: %s", description)
+        payload = self._NOTIFICATION_DATA.copy()
+        payload["content"] = description
         if data is not None:  # Allow empty dicts/lists as valid data
-            event_data["data"]["details"] = data
+            payload["details"] = data
 
-        if self.event_emitter:
-            await self.event_emitter(event_data)
+        await self._emit({"type": "notification", "data": payload})
 
     async def emit(
         self,
@@ -77,19 +225,15 @@ class EventEmitter:
         type: str = "status",
     ):
         """Emit a generic status update."""
-        logger.info(f"***Emitting message: {description}***")
-        if self.event_emitter:
-            await self.event_emitter(
-                {
-                    "type": type,   # Type of event, e.g., "status", "notification", etc.
-                    "data": {
-                        "status": status,
-                        "description": description,
-                        "done": done,
-                        "hidden": False,
-                    },
-                }
-            )
+        if self._emit is None:
+            return
+        logger.debug("Emitting status: %s", description)
+        payload = self._STATUS_DATA.copy()
+        payload["status"] = status
+        payload["description"] = description
+        payload["done"] = done
+        # Type of event, e.g., "status", "notification", etc.
+        await self._emit({"type": type, "data": payload})
 
 class Tools:
 
@@ -99,75 +243,135 @@ class Tools:
             description="Open Weather Map Api Key",
         )
 
+    # The defaults are plain env strings, so build them once without validation;
+    # the host swaps in its own validated Valves when the user edits them
+    _default_valves = Valves.model_construct()
+
     def __init__(self, __event_emitter__: Callable[[dict], Any], __event_call__: Callable[[dict], Any] = None):
-        self.valves = self.Valves()
+        self.valves = self._default_valves
         self.event_emitter = __event_emitter__
         self.emitter = EventEmitter(__event_emitter__, __event_call__)
 
+    async def close(self):
+        """Close the shared HTTP session; call this before the event loop ends."""
+        global _session, _session_loop
+        session, loop = _session, _session_loop
+        _session = _session_loop = None
+        if session is None or session.closed:
+            return
+        if loop is asyncio.get_running_loop():
+            await session.close()
+        else:
+            await _close_stale_session(session, loop)
+
     async def _get_geocoords(self, api_key: str, country: str, zipcode: str) -> dict:
-        
-        logger.info("Getting Geo Coordintes for weather look up")
+        key = (country, zipcode)
+        entry = _cache_get(_geo_cache, key, _GEO_STALE_MAX)
+        if entry and time.monotonic() < entry[0]:
+            return entry[1]
+
+        logger.debug("Getting geo coordinates for %s, %s", zipcode, country)
         await self.emitter.progress_update(
             f"Fetching geocoordinates for {zipcode}, {country}"
         )
-        url = f"http://api.openweathermap.org/geo/1.0/zip?zip={zipcode},{country}&appid={api_key}"
-        resp = requests.get(url)
-        logger.info(f"Coords Response: {resp.status_code}")
+        params = {"zip": f"{zipcode},{country}", "appid": api_key}
+        try:
+            data = await _get_json(_GEO_URL, params)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            if entry is not None:
+                logger.warning("Geocoding failed, serving cached coordinates: %s", _describe_error(e))
+                return entry[1]
+            message = f"Error fetching geocoordinates: {_describe_error(e)}"
+            await self.emitter.error_update(message)
+            logger.error(message)
+            raise Exception(message) from e
+        _cache_put(_geo_cache, key, _GEO_CACHE_TTL, data)
+        await self.emitter.success_update(
+            f"Successfully fetched geocoordinates for {zipcode}"
+        )
+        logger.debug("Successfully fetched geocoordinates for %s", zipcode)
+        return data
 
-        if resp.status_code != 200:
-            await self.emitter.error_update(
-                f"Error fetching geocoordinates: {resp.status_code} - {resp.text}"
-            )
-            logger.error(f"Error fetching geocoordinates: {resp.status_code} - {resp.text}")
-            raise Exception(f"Error fetching geocoordinates: {resp.status_code} - {resp.text}")
-        if resp.status_code == 200:
-            await self.emitter.success_update(
-                f"Successfully fetched geocoordinates for {zipcode}"
+    async def _fetch_weather(
+        self,
+        country: str,
+        zipcode: str,
+        endpoint: str = "data/2.5/weather",
+        units: str | None = "imperial",
+        api_key: str | None = None,
+    ) -> tuple[dict, dict]:
+        """Geocode a zipcode and fetch an OpenWeatherMap endpoint for it; returns (coords, data)."""
+        api_key = api_key or self.valves.api_key
+        coords = await self._get_geocoords(api_key, country, zipcode)
+        lat, lon = coords["lat"], coords["lon"]
+        await self.emitter.progress_update(
+            f"Fetching weather data for coordinates: LAT: {lat}, LONG: {lon}"
+        )
+        params = {"lat": lat, "lon": lon, "appid": api_key}
+        if units:
+            params["units"] = units
+        data = await _get_weather_json(
+            _WEATHER_URL.format(endpoint=endpoint), params, (endpoint, units, round(lat, 2), round(lon, 2))
+        )
+        logger.debug("Weather data for %s, %s: %s", zipcode, country, data)
+        return coords, data
+
+    async def get_weather_many(self, zipcodes: List[str]) -> str:
+        """
+        Get the current weather for several US zipcodes at once.
+
+        :param zipcodes: The zipcodes to look up, e.g. ["98012", "98101"]
+        """
+        # Bound concurrency so a long list doesn't trip OpenWeatherMap's rate limit
+        semaphore = asyncio.Semaphore(10)
+
+        async def fetch(zipcode: str) -> dict:
+            async with semaphore:
+                _, data = await self._fetch_weather("US", zipcode)
+                return data
+
+        results = await asyncio.gather(
+            *[fetch(zipcode) for zipcode in zipcodes], return_exceptions=True
+        )
+
+        lines = []
+        for zipcode, data in zip(zipcodes, results):
+            if isinstance(data, Exception):
+                lines.append(f"Weather in {zipcode}: Error fetching weather data: {_describe_error(data)}")
+                continue
+            lines.append(
+                f"Weather in {zipcode}: {data['weather'][0]['description']}, "
+                f"Temp: {data['main']['temp']}, Humidity: {data['main']['humidity']}, "
+                f"WindSpeed: {data['wind']['speed']}"
             )
-            logger.info(f"Successfully fetched geocoordinates for {zipcode}")
-            return resp.json()
-        return {}
+        await self.emitter.success_update(f"Fetched weather for {len(zipcodes)} zipcodes")
+        return "\n".join(lines)
 
     async def get_weather_forcast(self, ) -> str:
         """Get weather information for a given location."""
         try:
             await self.emitter.progress_update(f"Fetching weather for Bothell, WA")
-            api_key = os.getenv("WEATHER_API_KEY")
-            if not api_key:
+            if not _FORECAST_API_KEY:
                 raise ValueError("WEATHER_API_KEY environment variable is not set.")
-
-            try:
-                await self.emitter.progress_update(f"Fetching geocoordinates for Bothell, WA")
-                coords = await self._get_geocoords(api_key, "US", "98012")
-            except Exception as e: 
-                await self.emitter.error_update(f"Error fetching geocoordinates: {str(e)}")
-                return "Error fetching geocoordinates: " + str(e)
-
-            await self.emitter.progress_update(f"Coordinates for Bothell, WA: {coords}")
-            logger.info(f"Coordinates for Bothell, WA: {coords}")
-            await self.emitter.progress_update(f"Fetching weather data for Bothell, WA")
-            url = f"https://api.openweathermap.org/data/3.0/onecall?lat={coords['lat']}&lon={coords['lon']}&appid={api_key}"
-            response = requests.get(url)
-            response.raise_for_status()
-            data = response.json()
-
+            coords, data = await self._fetch_weather(
+                "US", "98012", endpoint="data/3.0/onecall", units=None, api_key=_FORECAST_API_KEY
+            )
             await self.emitter.success_update(f"Weather fetched successfully for Bothell, WA", data)
             return f"Weather data for {coords['name']}: {data}"
 
         except Exception as e:
-            await self.emitter.error_update(f"Error fetching weather for Bothell, WA: {str(e)}")
-            return "Error fetching weather: " + str(e)
+            await self.emitter.error_update(f"Error fetching weather for Bothell, WA: {_describe_error(e)}")
+            return "Error fetching weather: " + _describe_error(e)
         
     async def get_current_weather(self, __event_emitter__: Callable[[dict], Any] = None, __event_call__: Callable[[dict], Any] = None) -> str:
         """Get the current weather for a given zipcode."""
-        logger.info("\n\n***GETTING CURRENT WEATHER***\n\n")
+        logger.debug("Getting current weather")
         
         event_emitter = EventEmitter(__event_emitter__)
         await event_emitter.progress_update("Fetching current weather...")
         """Get geocoords first"""
 
         try:
-
             zipcode = await __event_call__(
                 {
                     "type": "input",
@@ -178,48 +382,30 @@ class Tools:
                     },
                 }
             )
-            coords = await self._get_geocoords(self.valves.api_key, "US", zipcode)
-            await event_emitter.progress_update(
-                f"Found Geolocation coordinates LAT: {coords['lat']}, LONG: {coords['lon']} "
-            )
-            logger.info(
-                f"\n\n*** COORDS: LAT: {coords['lat']}, LONG: {coords['lon']} ***\n\n"
+            _, data = await self._fetch_weather("US", zipcode)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            await event_emitter.error_update(
+                f"Error fetching weather data: {_describe_error(e)}"
             )
+            return f"Error fetching weather data: {_describe_error(e)}"
         except Exception as e:
-            logger.info(
-                f"***ERROR: There was an error retieving Coordinates for the location *** \n{e}\n"
-            )
+            logger.error("Error retrieving coordinates for the location: %s", e)
             return f"Error retrieving coordinates: {str(e)}"
 
         await event_emitter.progress_update(
-            f"Fetching weather data for coordinates: LAT: {coords['lat']}, LONG: {coords['lon']}"
+            f"Received weather data for {zipcode}."
         )
-
-        try:
-            weather_url = f"https://api.openweathermap.org/data/2.5/weather?lat={coords['lat']}&lon={coords['lon']}&appid={self.valves.api_key}&units=imperial"
-            response = requests.get(weather_url)
-            response.raise_for_status()  # Raise HTTPError for bad responses (4xx and 5xx)
-            data = response.json()
-            logger.info(f"\n\n***CURRENT WEATHER***\n{data}\n")
-            await event_emitter.progress_update(
-                f"Received weather data for {zipcode}."
-            )
-            if data.get("cod") != 200:
-                await event_emitter.error_update(
-                    f"Error fetching weather data: {data.get('message')}"
-                )
-                return f"Error fetching weather data: {data.get('message')}"
-
-            weather_description = data["weather"][0]["description"]
-            temperature = float(data["main"]["temp"])
-            humidity = data["main"]["humidity"]
-            wind_speed = data["wind"]["speed"]
-            await event_emitter.success_update(
-                f"Found Weather data for {zipcode}: {data['weather'][0]['description']}"
-            ) 
-            return f"Weather in {zipcode}: {weather_description}, Temp: {temperature}, Humidity: {humidity}, WindSpeed: {wind_speed}°C"
-        except requests.RequestException as e:
+        if data.get("cod") != 200:
             await event_emitter.error_update(
-                f"Error fetching weather data: {str(e)}"
+                f"Error fetching weather data: {data.get('message')}"
             )
-            return f"Error fetching weather data: {str(e)}"
+            return f"Error fetching weather data: {data.get('message')}"
+
+        weather_description = data["weather"][0]["description"]
+        temperature = float(data["main"]["temp"])
+        humidity = data["main"]["humidity"]
+        wind_speed = data["wind"]["speed"]
+        await event_emitter.success_update(
+            f"Found Weather data for {zipcode}: {data['weather'][0]['description']}"
+        ) 
+        return f"Weather in {zipcode}: {weather_description}, Temp: {temperature}, Humidity: {humidity}, WindSpeed: {wind_speed}°C"